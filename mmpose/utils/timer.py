@@ -77,6 +77,18 @@ class StopWatch:
             timer_name, timer = self._timer_stack.pop()
             self._record[timer_name].update(timer.since_start())
 
+    def add(self, time_elapsed, timer_name='_FPS_'):
+        """Add the time consuming of a code snippet that is timed outside the
+        stop watch. This is a lightweight alternative of `timeit` for
+        performance-critical loops.
+
+        Args:
+            time_elapsed (float): The time consuming in second.
+            timer_name (str): The unique name of the interested code snippet.
+                See `timeit` for details. Default: '_FPS_'.
+        """
+        self._record[timer_name].update(time_elapsed)
+
     def report(self, key=None):
         """Report timing information.
 
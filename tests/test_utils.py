@@ -40,6 +40,16 @@ def test_stopwatch():
     _ = stop_watch.report()
     _ = stop_watch.report_strings()
 
+    # test adding externally timed records
+    stop_watch = StopWatch(window=window_size)
+    for _ in range(test_loop):
+        stop_watch.add(outer_time / 1000.)
+        stop_watch.add(inner_time / 1000., 'inner')
+
+    report = stop_watch.report()
+    assert abs(report['_FPS_'] - 1000. / outer_time) < 1e-6
+    assert abs(report['inner'] - inner_time) < 1e-6
+
 
 def test_setup_multi_processes():
     # temp save system setting
@@ -46,8 +46,6 @@ class ModelResultBindingNode(Node):
         self.register_output_buffer(output_buffer)
 
     def set_runner(self, runner):
-        super().set_runner(runner)
-
         # Set synchronous according to the runner
         if runner.synchronous:
             self.synchronous = True
@@ -56,11 +54,15 @@ class ModelResultBindingNode(Node):
             self.synchronous = False
             essential_input = 'frame'
 
-        # Set essential input buffer according to the synchronous setting
+        # Set essential input buffer according to the synchronous setting.
+        # Note that this should be done before calling the set_runner() of
+        # the base class, where the input buffer information is resolved.
         for buffer_info in self._input_buffers:
             if buffer_info.input_name == essential_input:
                 buffer_info.essential = True
 
+        super().set_runner(runner)
+
     def process(self, input_msgs):
         result_msg = input_msgs['result']
 
@@ -3,14 +3,21 @@ import logging
 import time
 from abc import ABCMeta, abstractmethod
 from dataclasses import dataclass
-from queue import Empty
-from threading import Thread
+from threading import Event, Thread
 from typing import Callable, Dict, List, Optional, Tuple, Union
 
 from mmcv.utils.misc import is_method_overridden
 
 from mmpose.utils import StopWatch
-from ..utils import Message, VideoEndingMessage, limit_max_fps
+from ..utils import Message, VideoEndingMessage
+
+# Minimum interval (in second) between updating the route information of a
+# node. The information is reused by the output messages in between.
+NODE_INFO_UPDATE_INTERVAL = 0.2
+
+# Maximum timeout (in second) of waiting for the input of a node. See
+# `Node.run` for more information.
+MAX_INPUT_CHECK_INTERVAL = 0.05
 
 
 @dataclass
@@ -43,10 +50,16 @@ class Node(Thread, metaclass=ABCMeta):
                     'q', 'Q' and 27 are used for quit
             Default: None
         max_fps (int): Maximum FPS of the node. This is to avoid the node
-            running unrestrictedly and causing large resource consuming.
+            running unrestrictedly and causing large resource consuming. If
+            max_fps is None or not positive, the FPS will not be limited.
             Default: 30
-        input_check_interval (float): Minimum interval (in millisecond) between
-            checking if input is ready. Default: 0.001
+        input_check_interval (float): Timeout (in second) of waiting for the
+            input buffers to be updated. The node will be woken up as soon as
+            a new message is put into any of its input buffers, and this
+            timeout only ensures that the exit event is checked regularly.
+            The timeout is doubled each time it's reached, up to
+            `MAX_INPUT_CHECK_INTERVAL`, and reset once the input is ready.
+            Default: 0.01
         enable (bool): Default enable/disable status. Default: True.
         daemon (bool): Whether node is a daemon. Default: True.
     """
@@ -59,20 +72,40 @@ class Node(Thread, metaclass=ABCMeta):
                  enable: bool = True,
                  daemon=False):
         super().__init__(name=name, daemon=daemon)
-        self._runner = None
         self._enabled = enable
         self.enable_key = enable_key
         self.max_fps = max_fps
+        # Minimum interval (in second) of processing a frame, or None if the
+        # FPS is not limited
+        self._min_process_interval = (1.0 / max_fps if max_fps and max_fps > 0
+                                      else None)
         self.input_check_interval = input_check_interval
 
         # A partitioned buffer manager the runner's buffer manager that
         # only accesses the buffers related to the node
         self._buffer_manager = None
 
-        # Input/output buffers are a list of registered buffers' information
+        # Input buffers are a list of registered buffers' information, and
+        # output buffers are a list of registered buffer names
         self._input_buffers = []
         self._output_buffers = []
 
+        # An event that is set whenever a message is put into any input
+        # buffer. It is used to wait for the input instead of polling
+        self._input_ready = Event()
+
+        # Tuples of (buffer_name, input_name, essential) of input buffers and
+        # names of output buffers. They are resolved in set_runner() to
+        # avoid accessing the buffer information in each loop
+        self._input_plan = ()
+        self._output_plan = ()
+        # Names of essential input buffers that need to be checked before
+        # fetching any input. See set_runner() for more information
+        self._essential_check = ()
+        # The default input where all input messages are None. It is copied
+        # to pack the inputs in each loop
+        self._input_template = {}
+
         # Event manager is a copy of assigned runner's event manager
         self._event_manager = None
 
@@ -82,13 +115,14 @@ class Node(Thread, metaclass=ABCMeta):
         # handlers, but one can still access the raw event by _event_manager
         self._registered_events = []
 
-        # A list of (listener_threads, event_info)
-        # See set_runner() for more information
-        self._event_listener_threads = []
-
         # A timer to calculate node FPS
         self._timer = StopWatch(window=10)
 
+        # The cached route information and the (monotonic) time it was
+        # updated. See run() for more information
+        self._node_info = None
+        self._node_info_time = 0.
+
         # Register enable toggle key
         if self.enable_key:
             # If the node allows toggling enable, it should override the
@@ -107,7 +141,9 @@ class Node(Thread, metaclass=ABCMeta):
 
     @property
     def registered_buffers(self):
-        return self._input_buffers + self._output_buffers
+        return self._input_buffers + [
+            BufferInfo(buffer_name) for buffer_name in self._output_buffers
+        ]
 
     @property
     def registered_events(self):
@@ -156,17 +192,16 @@ class Node(Thread, metaclass=ABCMeta):
         if not isinstance(buffer_name, list):
             buffer_name = [buffer_name]
 
-        for name in buffer_name:
-            buffer_info = BufferInfo(name)
-            self._output_buffers.append(buffer_info)
+        self._output_buffers.extend(buffer_name)
 
     def register_event(self,
                        event_name: str,
                        is_keyboard: bool = False,
                        handler_func: Optional[Callable] = None):
         """Register an event. All events used in the node need to be registered
-        in __init__(). If a callable handler is given, a thread will be create
-        to listen and handle the event when the node starts.
+        in __init__(). If a callable handler is given, it will be registered
+        to the runner's event manager when the node starts, and invoked each
+        time the event is set.
 
         Args:
             Args:
@@ -185,12 +220,39 @@ class Node(Thread, metaclass=ABCMeta):
     def set_runner(self, runner):
         # Get partitioned buffer manager
         buffer_names = [
-            buffer.buffer_name
-            for buffer in self._input_buffers + self._output_buffers
-        ]
+            buffer.buffer_name for buffer in self._input_buffers
+        ] + self._output_buffers
         self._buffer_manager = runner.buffer_manager.get_sub_manager(
             buffer_names)
 
+        # Resolve the I/O buffers
+        # Essential inputs are placed first, so that no inessential input will
+        # be fetched if an essential input is not ready
+        self._input_plan = tuple(
+            sorted(((buffer.buffer_name, buffer.input_name, buffer.essential)
+                    for buffer in self._input_buffers),
+                   key=lambda x: not x[2]))
+        self._output_plan = tuple(self._output_buffers)
+        self._input_template = {
+            buffer.input_name: None
+            for buffer in self._input_buffers
+        }
+        # With multiple essential inputs, all of them should be checked before
+        # fetching any. Otherwise, the fetched essential inputs would be lost
+        # if a later one is not ready.
+        essential_buffers = tuple(
+            buffer_name for buffer_name, _, essential in self._input_plan
+            if essential)
+        if len(essential_buffers) > 1:
+            self._essential_check = essential_buffers
+        else:
+            self._essential_check = ()
+
+        # Get notified when the input buffers are updated
+        for buffer_info in self._input_buffers:
+            self._buffer_manager.add_listener(buffer_info.buffer_name,
+                                              self._input_ready)
+
         # Get event manager
         self._event_manager = runner.event_manager
 
@@ -210,30 +272,22 @@ class Node(Thread, metaclass=ABCMeta):
         """
         buffer_manager = self._buffer_manager
 
-        if buffer_manager is None:
-            raise ValueError(f'{self.name}: Runner not set!')
-
         # Check that essential buffers are ready
-        for buffer_info in self._input_buffers:
-            if buffer_info.essential and buffer_manager.is_empty(
-                    buffer_info.buffer_name):
+        for buffer_name in self._essential_check:
+            if buffer_manager.is_empty(buffer_name):
                 return False, None
 
         # Default input
-        result = {
-            buffer_info.input_name: None
-            for buffer_info in self._input_buffers
-        }
-
-        for buffer_info in self._input_buffers:
-            try:
-                result[buffer_info.input_name] = buffer_manager.get(
-                    buffer_info.buffer_name, block=False)
-            except Empty:
-                if buffer_info.essential:
-                    # Return unsuccessful flag if any
-                    # essential input is unready
-                    return False, None
+        result = self._input_template.copy()
+
+        for buffer_name, input_name, essential in self._input_plan:
+            ready, msg = buffer_manager.try_get(buffer_name)
+            if ready:
+                result[input_name] = msg
+            elif essential:
+                # Return unsuccessful flag if any
+                # essential input is unready
+                return False, None
 
         return True, result
 
@@ -245,9 +299,8 @@ class Node(Thread, metaclass=ABCMeta):
             force (bool, optional): If True, block until the output message
                 has been put into all output buffers. Default: False
         """
-        for buffer_info in self._output_buffers:
-            buffer_name = buffer_info.buffer_name
-            self._buffer_manager.put_force(buffer_name, output_msg)
+        self._buffer_manager.put_many(
+            self._output_plan, output_msg, force=True)
 
     @abstractmethod
     def process(self, input_msgs: Dict[str, Message]) -> Union[Message, None]:
@@ -304,45 +357,76 @@ class Node(Thread, metaclass=ABCMeta):
         not override this method in subclasses.
         """
 
+        # The buffer/event managers are set by the runner. They are checked
+        # once here instead of in each loop
+        if self._buffer_manager is None or self._event_manager is None:
+            raise ValueError(f'{self.name}: Runner not set!')
+
         logging.info(f'Node {self.name} starts')
 
-        # Create event listener threads
+        # Register event handlers. The handlers will be invoked by the event
+        # manager in a dispatcher thread shared by all nodes
         for event_info in self._registered_events:
 
             if event_info.handler_func is None:
                 continue
 
-            def event_listener():
-                while True:
-                    with self._event_manager.wait_and_handle(
-                            event_info.event_name, event_info.is_keyboard):
-                        event_info.handler_func()
-
-            t_listener = Thread(target=event_listener, args=(), daemon=True)
-            t_listener.start()
-            self._event_listener_threads.append(t_listener)
+            self._event_manager.register_handler(event_info.event_name,
+                                                 event_info.handler_func,
+                                                 event_info.is_keyboard)
+
+        # Without an enable key, the enable status of the node can not be
+        # toggled. In this case, the status does not need to be checked in
+        # the loop unless the node is disabled.
+        check_enabled = self.enable_key is not None or not self._enabled
+
+        # Timeout of waiting for the input, which backs off exponentially
+        # when no input arrives
+        input_check_interval = self.input_check_interval
+        wait_timeout = input_check_interval
+        max_wait_timeout = max(input_check_interval, MAX_INPUT_CHECK_INTERVAL)
+
+        # Bind the functions and attributes used in the loop to local
+        # variables, which are faster to access than global names and
+        # attributes
+        monotonic = time.monotonic
+        sleep = time.sleep
+        is_event_set = self._event_manager.is_set
+        input_ready = self._input_ready
+        get_input = self._get_input_from_buffer
+        send_output = self._send_output_to_buffers
+        process = self.process
+        timer_add = self._timer.add
+        min_process_interval = self._min_process_interval
 
         # Loop
         while True:
             # Exit
-            if self._event_manager.is_set('_exit_'):
+            if is_event_set('_exit_'):
                 self.on_exit()
                 break
 
+            # Clear the input event before checking the input, so that a
+            # message arriving after the check will still wake up the node
+            input_ready.clear()
+
             # Check if input is ready
-            input_status, input_msgs = self._get_input_from_buffer()
+            input_status, input_msgs = get_input()
 
             # Input is not ready
             if not input_status:
-                time.sleep(self.input_check_interval)
+                if not input_ready.wait(wait_timeout):
+                    wait_timeout = min(wait_timeout * 2, max_wait_timeout)
                 continue
 
+            wait_timeout = input_check_interval
+
             # If a VideoEndingMessage is received, broadcast the signal
             # without invoking process() or bypass()
             video_ending = False
             for _, msg in input_msgs.items():
                 if isinstance(msg, VideoEndingMessage):
-                    self._send_output_to_buffers(msg)
+                    send_output(msg)
                     video_ending = True
                     break
 
@@ -351,22 +435,41 @@ class Node(Thread, metaclass=ABCMeta):
                 break
 
             # Check if enabled
-            if not self._enabled:
+            if check_enabled and not self._enabled:
                 # Override bypass method to define node behavior when disabled
                 output_msg = self.bypass(input_msgs)
             else:
-                with self._timer.timeit():
-                    with limit_max_fps(self.max_fps):
-                        # Process
-                        output_msg = self.process(input_msgs)
+                # The processing, FPS limiting, timing and route information
+                # updating are done inline in one pass, which needs only one
+                # clock reading after processing unless the node sleeps
+                t_start = monotonic()
+                # Process
+                output_msg = process(input_msgs)
+                t_end = monotonic()
+
+                # Limit the maximum FPS
+                if min_process_interval is not None:
+                    t_sleep = t_start + min_process_interval - t_end
+                    if t_sleep > 0:
+                        sleep(t_sleep)
+                        t_end = monotonic()
+
+                # Update the node FPS
+                timer_add(t_end - t_start)
 
                 if output_msg:
-                    # Update route information
-                    node_info = self._get_node_info()
-                    output_msg.update_route_info(node=self, info=node_info)
+                    # Update route information. The node information is
+                    # cached and only updated once per
+                    # NODE_INFO_UPDATE_INTERVAL seconds
+                    if (self._node_info is None or t_end -
+                            self._node_info_time > NODE_INFO_UPDATE_INTERVAL):
+                        self._node_info = self._get_node_info()
+                        self._node_info_time = t_end
+                    output_msg.update_route_info(
+                        node=self, info=self._node_info)
 
             # Send output message
             if output_msg is not None:
-                self._send_output_to_buffers(output_msg)
+                send_output(output_msg)
 
         logging.info(f'{self.name}: process ending.')
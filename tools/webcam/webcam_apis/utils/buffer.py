@@ -1,12 +1,21 @@
 # Copyright (c) OpenMMLab. All rights reserved.
+import time
+from collections import deque
 from functools import wraps
-from queue import Queue
+from queue import Empty, Full, Queue
+from threading import Event
 from typing import Dict, List, Optional
 
 from mmcv import is_seq_of
 
 __all__ = ['BufferManager']
 
+# Behaviors of `put` when the buffer is full:
+#   - 'block': block until there is room for the incoming item
+#   - 'drop_oldest': remove the earliest item to make room for the incoming
+#       item without blocking, like `put_force`
+BUFFER_POLICIES = ('block', 'drop_oldest')
+
 
 def check_buffer_registered(exist=True):
 
@@ -32,6 +41,37 @@ def check_buffer_registered(exist=True):
 
 
 class Buffer(Queue):
+    """A thread-safe FIFO buffer to pass messages between the runner and
+    nodes.
+
+    Since all nodes run as threads in the same process, the buffer is based
+    on `queue.Queue` instead of `multiprocessing.Queue`. Messages are passed
+    by reference without being pickled or copied, so a message (and its
+    frame image) should not be modified by the producer after it's put into
+    the buffer.
+
+    Parameters:
+        maxsize (int): The maximum number of items in the buffer. If
+            maxsize <= 0, the buffer size is infinite. Default: 0
+        policy (str): The behavior of `put` when the buffer is full. Options
+            are 'block' and 'drop_oldest'. See `BUFFER_POLICIES` for
+            details. Default: 'block'
+    """
+
+    def __init__(self, maxsize=0, policy='block'):
+        if policy not in BUFFER_POLICIES:
+            raise ValueError(f'Invalid buffer policy "{policy}". Options are '
+                             f'{BUFFER_POLICIES}')
+        super().__init__(maxsize)
+        self.policy = policy
+        # Events to set whenever a new item is put into the buffer
+        self._listeners = []
+
+    def _init(self, maxsize):
+        # A bounded buffer is backed by a deque with `maxlen`, which discards
+        # the earliest item in O(1) when a new item is appended to it while
+        # full. This makes `put_force` a single append.
+        self.queue = deque(maxlen=maxsize if maxsize > 0 else None)
 
     def put_force(self, item):
         """Force to put an item into the buffer.
@@ -40,15 +80,231 @@ class Buffer(Queue):
         remove to make room for the incoming item.
         """
         with self.mutex:
-            if self.maxsize > 0:
-                while self._qsize() >= self.maxsize:
-                    _ = self._get()
-                    self.unfinished_tasks -= 1
+            if 0 < self.maxsize <= self._qsize():
+                # The earliest item is discarded by the bounded deque
+                self.unfinished_tasks -= 1
 
             self._put(item)
             self.unfinished_tasks += 1
             self.not_empty.notify()
 
+        self._notify_listeners()
+
+    def put(self, item, block=True, timeout=None):
+        if self.policy == 'drop_oldest':
+            self.put_force(item)
+            return
+
+        super().put(item, block, timeout)
+        self._notify_listeners()
+
+    def put_batch(self, items: List, force: bool = False):
+        """Put multiple items into the buffer at once.
+
+        The buffer lock is acquired only once and the consumers are notified
+        only once for the whole batch, which is cheaper than calling `put`
+        for each item.
+
+        Args:
+            items (list): The items to put into the buffer in order.
+            force (bool): If True, the earliest items in the buffer will be
+                removed to make room for the incoming items like `put_force`.
+                Otherwise, an exception `queue.Full` will be raised without
+                putting any item if the buffer does not have enough room.
+                Default: False.
+        """
+        if not items:
+            return
+
+        with self.mutex:
+            num_items = len(items)
+            num_removed = 0
+            if self.maxsize > 0:
+                num_overflow = self._qsize() + num_items - self.maxsize
+                if num_overflow > 0:
+                    if not force:
+                        raise Full
+                    # The earliest items are discarded by the bounded deque
+                    num_removed = num_overflow
+
+            self.queue.extend(items)
+            self.unfinished_tasks += num_items - num_removed
+            self.not_empty.notify(num_items)
+
+        self._notify_listeners()
+
+    def try_get(self):
+        """Get an item from the buffer without blocking.
+
+        Unlike `get(block=False)`, no exception is raised if the buffer is
+        empty, and checking the buffer and getting the item are done under a
+        single lock acquisition.
+
+        Returns:
+            tuple: (True, item) if an item is got, otherwise (False, None).
+        """
+        with self.mutex:
+            if not self._qsize():
+                return False, None
+            item = self._get()
+            self.not_full.notify()
+            return True, item
+
+    def add_listener(self, event: Event):
+        """Add an event that will be set whenever a new item is put into the
+        buffer.
+
+        This allows the consumer to wait for the buffer to be updated instead
+        of polling it.
+        """
+        self._listeners.append(event)
+
+    def _notify_listeners(self):
+        for event in self._listeners:
+            event.set()
+
+
+class SPSCRingBuffer():
+    """A ring buffer for the single-producer-single-consumer case, e.g. the
+    camera frames fed to the model inference node.
+
+    Unlike `Buffer`, no lock is acquired to put or get an item. The items are
+    stored in a `collections.deque` with `maxlen`, whose `append` and
+    `popleft` are atomic in CPython and discard the earliest item on
+    overflow. Events are only involved when a blocking `put` or `get` has to
+    wait for the other side.
+
+    Note that the buffer should have only one producer thread and one
+    consumer thread. Otherwise, a blocking `put` may overflow the buffer and
+    discard the earliest item.
+
+    Parameters:
+        maxsize (int): The capacity of the buffer. If maxsize <= 0, the buffer
+            size is infinite. Default: 0
+        policy (str): The behavior of `put` when the buffer is full. Options
+            are 'block' and 'drop_oldest'. See `BUFFER_POLICIES` for
+            details. Default: 'block'
+    """
+
+    def __init__(self, maxsize=0, policy='block'):
+        if policy not in BUFFER_POLICIES:
+            raise ValueError(f'Invalid buffer policy "{policy}". Options are '
+                             f'{BUFFER_POLICIES}')
+        self.maxsize = maxsize
+        self.policy = policy
+        self._slots = deque(maxlen=maxsize if maxsize > 0 else None)
+        self._not_empty = Event()
+        self._not_full = Event()
+        self._not_full.set()
+        # Events to set whenever a new item is put into the buffer
+        self._listeners = []
+
+    def qsize(self):
+        return len(self._slots)
+
+    def empty(self):
+        return not self._slots
+
+    def full(self):
+        return 0 < self.maxsize <= len(self._slots)
+
+    def put(self, item, block=True, timeout=None):
+        if self.maxsize > 0 and self.policy == 'block':
+            deadline = None if timeout is None else time.monotonic() + timeout
+            while len(self._slots) >= self.maxsize:
+                if not block:
+                    raise Full
+                # Clear the event before checking again, so that an item got
+                # by the consumer after the check will still wake up the wait
+                self._not_full.clear()
+                if len(self._slots) < self.maxsize:
+                    break
+                if deadline is None:
+                    self._not_full.wait()
+                else:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise Full
+                    self._not_full.wait(remaining)
+
+        self.put_force(item)
+
+    def put_force(self, item):
+        """Force to put an item into the buffer.
+
+        If the buffer is already full, the earliest item in the buffer will be
+        remove to make room for the incoming item.
+        """
+        self._slots.append(item)
+        self._on_put()
+
+    def put_batch(self, items: List, force: bool = False):
+        """Put multiple items into the buffer at once.
+
+        See `Buffer.put_batch` for details.
+        """
+        if not items:
+            return
+
+        if not force and 0 < self.maxsize < len(self._slots) + len(items):
+            raise Full
+
+        self._slots.extend(items)
+        self._on_put()
+
+    def get(self, block=True, timeout=None):
+        deadline = None
+        while True:
+            try:
+                item = self._slots.popleft()
+                break
+            except IndexError:
+                if not block:
+                    raise Empty
+                # Clear the event before checking again, so that an item put
+                # by the producer after the check will still wake up the wait
+                self._not_empty.clear()
+                if self._slots:
+                    continue
+                if timeout is None:
+                    self._not_empty.wait()
+                else:
+                    if deadline is None:
+                        deadline = time.monotonic() + timeout
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise Empty
+                    self._not_empty.wait(remaining)
+
+        if not self._not_full.is_set():
+            self._not_full.set()
+        return item
+
+    def try_get(self):
+        """Get an item from the buffer without blocking.
+
+        See `Buffer.try_get` for details.
+        """
+        try:
+            item = self._slots.popleft()
+        except IndexError:
+            return False, None
+
+        if not self._not_full.is_set():
+            self._not_full.set()
+        return True, item
+
+    def add_listener(self, event: Event):
+        """Add an event that will be set whenever a new item is put into the
+        buffer."""
+        self._listeners.append(event)
+
+    def _on_put(self):
+        if not self._not_empty.is_set():
+            self._not_empty.set()
+        for event in self._listeners:
+            event.set()
+
 
 class BufferManager():
 
@@ -59,36 +315,81 @@ class BufferManager():
         if buffers is None:
             self._buffers = {}
         else:
-            if is_seq_of(list(buffers.values()), buffer_type):
+            if is_seq_of(
+                    list(buffers.values()), (buffer_type, SPSCRingBuffer)):
                 self._buffers = buffers.copy()
             else:
                 raise ValueError('The values of buffers should be instance '
-                                 f'of {buffer_type}')
+                                 f'of {buffer_type} or {SPSCRingBuffer}')
 
     def __contains__(self, name):
         return name in self._buffers
 
     @check_buffer_registered(False)
-    def register_buffer(self, name, maxsize=0):
-        self._buffers[name] = self.buffer_type(maxsize)
+    def register_buffer(self, name, maxsize=0, spsc=False, policy='block'):
+        """Register a buffer.
+
+        Args:
+            name (str): The buffer name.
+            maxsize (int): The maximum size of the buffer. If maxsize <= 0,
+                the buffer size is infinite. Default: 0
+            spsc (bool): If True, a lock-free `SPSCRingBuffer` will be
+                created instead of the default buffer type. This should only
+                be used when the buffer has a single producer and a single
+                consumer. Default: False
+            policy (str): The behavior of `put` when the buffer is full.
+                'block' will block until there is room for the incoming item,
+                and 'drop_oldest' will remove the earliest item in the buffer
+                instead, so that the producer never blocks. Note that the
+                policy only affects the producer. A node still waits until
+                its essential input buffers are not empty. Default: 'block'
+        """
+        buffer_type = SPSCRingBuffer if spsc else self.buffer_type
+        self._buffers[name] = buffer_type(maxsize, policy)
 
     @check_buffer_registered()
+    def add_listener(self, name, event):
+        self._buffers[name].add_listener(event)
+
+    # The following I/O methods are invoked by nodes in each loop, so they
+    # are not wrapped by `check_buffer_registered` to save the overhead.
+    # Accessing an unregistered buffer will raise a KeyError.
     def put(self, name, item, block=True, timeout=None):
         self._buffers[name].put(item, block, timeout)
 
-    @check_buffer_registered()
     def put_force(self, name, item):
         self._buffers[name].put_force(item)
 
-    @check_buffer_registered()
+    def put_batch(self, name, items, force=False):
+        self._buffers[name].put_batch(items, force)
+
     def get(self, name, block=True, timeout=None):
         return self._buffers[name].get(block, timeout)
 
-    @check_buffer_registered()
+    def put_many(self, names, item, force=False):
+        """Put an item into multiple buffers, e.g. the output message of a
+        node into all its output buffers.
+
+        Args:
+            names (Sequence[str]): The buffer names.
+            item: The item to put.
+            force (bool): If True, the item will be put by `put_force`.
+                Otherwise, `put` will be used. Default: False
+        """
+        buffers = self._buffers
+        if force:
+            for name in names:
+                buffers[name].put_force(item)
+        else:
+            for name in names:
+                buffers[name].put(item)
+
+    def try_get(self, name):
+        return self._buffers[name].try_get()
+
     def is_empty(self, name):
         return self._buffers[name].empty()
 
-    @check_buffer_registered()
     def is_full(self, name):
         return self._buffers[name].full()
 
@@ -1,14 +1,23 @@
 # Copyright (c) OpenMMLab. All rights reserved.
+import logging
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import contextmanager
 from threading import Event
-from typing import Optional
+from typing import Callable, Optional
 
 
 class EventManager():
 
     def __init__(self):
         self._events = defaultdict(Event)
+        # Registered handler functions of events
+        self._handlers = defaultdict(list)
+        # A single dispatcher thread that invokes the handlers of all events.
+        # Handlers are invoked in the order that the events are set. The
+        # thread is started on the first submission.
+        self._dispatcher = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix='EventDispatcher')
 
     def register_event(self,
                        event_name: str = None,
@@ -17,10 +26,64 @@ class EventManager():
             event_name = self._get_keyboard_event_name(event_name)
         self._events[event_name] = Event()
 
+    def register_handler(self,
+                         event_name: str,
+                         handler_func: Callable,
+                         is_keyboard: bool = False):
+        """Register a handler function of an event.
+
+        Each time the event is set, its handlers will be invoked once in the
+        dispatcher thread. This avoids creating a listener thread for each
+        handler.
+
+        Args:
+            event_name (str|int): The event name. If is_keyboard==True,
+                event_name should be a str (as char) or an int (as ascii)
+            handler_func (callable): The event handler function, which should
+                be a callable object with no arguments or return values.
+            is_keyboard (bool): Indicate whether it is an keyboard
+                event. Default: False.
+        """
+        if is_keyboard:
+            event_name = self._get_keyboard_event_name(event_name)
+        self._handlers[event_name].append(handler_func)
+
     def set(self, event_name: str = None, is_keyboard: bool = False):
         if is_keyboard:
             event_name = self._get_keyboard_event_name(event_name)
-        return self._events[event_name].set()
+        event = self._events[event_name]
+        event.set()
+        if event_name in self._handlers:
+            self._dispatcher.submit(self._handle, event_name)
+        if is_keyboard:
+            # A keyboard event is a pulse: the threads waiting for the key
+            # are woken up, but the event is not kept set. So each key press
+            # is captured as a new event, and two key presses will not be
+            # collapsed into one.
+            event.clear()
+
+    def set_keyboard(self, key):
+        """Set a keyboard event when the key is pressed."""
+        return self.set(key, is_keyboard=True)
+
+    def wait_keyboard(self, key, timeout: Optional[float] = None):
+        """Block until the key is pressed.
+
+        Since keyboard events are pulses, only the key presses after calling
+        this method will be captured.
+
+        Returns:
+            bool: False if the timeout is reached, otherwise True.
+        """
+        return self.wait(key, is_keyboard=True, timeout=timeout)
+
+    def _handle(self, event_name: str):
+        """Invoke the handlers of an event."""
+        for handler_func in self._handlers[event_name]:
+            try:
+                handler_func()
+            except Exception:
+                logging.exception(f'Fail to handle event "{event_name}"')
 
     def wait(self,
              event_name: str = None,
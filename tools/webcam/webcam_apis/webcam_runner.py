@@ -1,9 +1,9 @@
 # Copyright (c) OpenMMLab. All rights reserved.
 import logging
 import sys
-import time
 import warnings
 from contextlib import nullcontext
+from queue import Empty
 from threading import Thread
 from typing import Dict, List, Optional, Tuple, Union
 
@@ -74,16 +74,24 @@ class WebcamRunner():
             raise ValueError('No node is registered to the runner.')
 
         # Register default buffers
+        # The camera frames are put into `_frame_` and `_input_` with the
+        # 'drop_oldest' policy, so that reading the camera is never blocked
+        # by slow nodes, and the nodes always get the latest frame
         if buffer_sizes is None:
             buffer_sizes = {}
         # _frame_ buffer
         frame_buffer_size = buffer_sizes.get('_frame_',
                                              DEFAULT_FRAME_BUFFER_SIZE)
-        self.buffer_manager.register_buffer('_frame_', frame_buffer_size)
+        self.buffer_manager.register_buffer(
+            '_frame_', frame_buffer_size, policy='drop_oldest')
         # _input_ buffer
+        # The camera reading thread is the only producer of `_input_`, and
+        # usually a model inference node is the only consumer. So a lock-free
+        # SPSC ring buffer is used.
         input_buffer_size = buffer_sizes.get('_input_',
                                              DEFAULT_INPUT_BUFFER_SIZE)
-        self.buffer_manager.register_buffer('_input_', input_buffer_size)
+        self.buffer_manager.register_buffer(
+            '_input_', input_buffer_size, spsc=True, policy='drop_oldest')
         # _display_ buffer
         display_buffer_size = buffer_sizes.get('_display_',
                                                DEFAULT_DISPLAY_BUFFER_SIZE)
@@ -172,7 +180,7 @@ class WebcamRunner():
                         node_name='Camera Info',
                         node_type='dummy',
                         info=self._get_camera_info())
-                    self.buffer_manager.put_force('_input_', input_msg)
+                    self.buffer_manager.put('_input_', input_msg)
 
                 else:
                     # Put a video ending signal
@@ -186,16 +194,18 @@ class WebcamRunner():
         output_msg = None
 
         while not self.event_manager.is_set('_exit_'):
-            while self.buffer_manager.is_empty('_display_'):
-                time.sleep(0.001)
+            # acquire output from buffer
+            # Block until an output is ready instead of polling the buffer.
+            # The timeout allows checking the exit event regularly.
+            try:
+                output_msg = self.buffer_manager.get('_display_', timeout=0.1)
+            except Empty:
+                continue
 
             # Set _idle_ to allow reading next frame
             if self.synchronous:
                 self.event_manager.set('_idle_')
 
-            # acquire output from buffer
-            output_msg = self.buffer_manager.get('_display_')
-
             # None indicates input stream ends
             if isinstance(output_msg, VideoEndingMessage):
                 self.event_manager.set('_exit_')
@@ -221,7 +231,7 @@ class WebcamRunner():
             self.event_manager.set('_exit_')
         else:
             logging.info(f'Keyboard event captured: {key}')
-            self.event_manager.set(key, is_keyboard=True)
+            self.event_manager.set_keyboard(key)
 
     def _get_camera_info(self):
         """Return the camera information in a dict."""
@@ -242,6 +252,11 @@ class WebcamRunner():
         """Program entry.
 
         This method starts all nodes as well as video I/O in separate threads.
+
+        Note that although each node runs in its own thread, an idle node
+        does not compete for the GIL: it blocks on an event until one of its
+        input buffers is updated (see `Node.run`). Event handlers of all
+        nodes are invoked in a single dispatcher thread of the event manager.
         """
 
         try: